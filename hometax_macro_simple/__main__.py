@@ -14,6 +14,8 @@ def main():
     widget.resize(800, 600)
     widget.show()
 
+    app.aboutToQuit.connect(widget.session.stop_keep_alive)
+    app.aboutToQuit.connect(widget.pipeline.shutdown)
     app.aboutToQuit.connect(webdriver.close)
     sys.exit(app.exec())
 
@@ -5,3 +5,9 @@ import pandas
 class InvalidDataException(Exception):
     def __init__(self, message: str):
         super().__init__(message)
+
+
+# 로그아웃 또는 세션 만료 후 재로그인을 기다리다 제한 시간을 넘겼을 때 발생.
+class SessionExpiredException(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
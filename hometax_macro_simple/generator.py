@@ -0,0 +1,163 @@
+# 부하, 대용량 테스트용 근로소득 엑셀 파일 생성.
+import argparse
+import logging
+import math
+import random
+from typing import Optional
+
+import pandas
+from pandas import DataFrame
+
+from hometax_macro_simple.macro import _COLUMN_NAMES
+
+_HEADER_ROWS: int = 6  # Macro 는 앞의 6행을 건너뛰고 7행부터 읽음.
+_TITLE: str = "엑셀 일괄등록 양식(지급명세서작성용)"
+
+_SURNAMES: list[str] = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임", "한", "오", "서", "신", "권", "황", "안", "송"]
+_NAME_SYLLABLES: list[str] = ["민", "서", "준", "예", "도", "하", "지", "윤", "현", "수", "우", "은", "진", "영", "성", "혁", "정",
+                              "원", "재", "희", "경", "상", "인", "옥", "식", "동"]
+
+# 주민등록번호 검증 가중치. (앞 12자리)
+_PERSONAL_ID_WEIGHTS: list[int] = [2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5]
+
+# 소득세 실효세율. (급여 상한, 세율)
+_INCOME_TAX_RATES: list[tuple[int, float]] = [
+    (20_000_000, 0.005),
+    (30_000_000, 0.01),
+    (45_000_000, 0.025),
+    (60_000_000, 0.04),
+    (80_000_000, 0.06),
+    (120_000_000, 0.09),
+    (math.inf, 0.14),
+]
+_NATIONAL_PENSION_RATE: float = 0.045
+_NATIONAL_PENSION_MONTHLY_CAP: int = 5_900_000
+_HEALTH_INSURANCE_RATE: float = 0.03545 * 1.1295  # 노인장기요양보험료 포함
+_EMPLOYMENT_INSURANCE_RATE: float = 0.009
+
+# record._validate_* 검증 규칙별 오류 행.
+INVALID_RULES: list[str] = ["name", "personal_id", "date", "salary", "number"]
+_NUMBER_FIELDS: list[str] = ["소득세", "지방소득세", "국민연금보험료", "건강보험료", "고용보험료"]
+
+
+# 검증숫자가 올바른 주민등록번호 생성.
+# 앞자리가 0 인 번호는 엑셀 숫자 셀에서 12자리가 되므로 1960~1999년생만 생성.
+def generate_personal_id(rng: random.Random) -> str:
+    birth = f"{rng.randint(60, 99):02d}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+    body = birth + rng.choice("12") + "".join(rng.choice("0123456789") for _ in range(5))
+    return body + str(_personal_id_check_digit(body))
+
+
+def is_valid_personal_id(personal_id: str) -> bool:
+    return (len(personal_id) == 13 and personal_id.isdigit()
+            and _personal_id_check_digit(personal_id[:12]) == int(personal_id[12]))
+
+
+def _personal_id_check_digit(body: str) -> int:
+    total = sum(int(digit) * weight for digit, weight in zip(body, _PERSONAL_ID_WEIGHTS))
+    return (11 - total % 11) % 10
+
+
+def _generate_name(rng: random.Random) -> str:
+    return rng.choice(_SURNAMES) + "".join(rng.choice(_NAME_SYLLABLES) for _ in range(rng.choice([1, 2, 2, 2])))
+
+
+# 급여: 중앙값 약 3,800만원의 로그정규분포.
+def _generate_salary(rng: random.Random) -> int:
+    salary = rng.lognormvariate(math.log(38_000_000), 0.45)
+    return int(min(max(salary, 12_000_000), 300_000_000)) // 1000 * 1000
+
+
+def _income_tax(salary: int) -> int:
+    rate = next(rate for limit, rate in _INCOME_TAX_RATES if salary <= limit)
+    return int(salary * rate) // 10 * 10
+
+
+def _generate_row(rng: random.Random, year: int) -> dict:
+    salary = _generate_salary(rng)
+    income_tax = _income_tax(salary)
+    start_date = f"{year}0101" if rng.random() < 0.85 else f"{year}{rng.randint(2, 12):02d}01"
+    end_date = f"{year}1231" if rng.random() < 0.9 else f"{year}{rng.randint(int(start_date[4:6]), 12):02d}28"
+    return {
+        "성명": _generate_name(rng),
+        "주민등록번호": int(generate_personal_id(rng)),
+        "시작일자": start_date,
+        "종료일자": end_date,
+        "급여": salary,
+        "소득세": income_tax,
+        "지방소득세": income_tax // 10 // 10 * 10,
+        "국민연금보험료": int(min(salary, _NATIONAL_PENSION_MONTHLY_CAP * 12) * _NATIONAL_PENSION_RATE) // 10 * 10,
+        "건강보험료": int(salary * _HEALTH_INSURANCE_RATE) // 10 * 10,
+        "고용보험료": int(salary * _EMPLOYMENT_INSURANCE_RATE) // 10 * 10,
+    }
+
+
+# 검증 규칙 하나를 위반하도록 행을 변경.
+def _invalidate_row(rng: random.Random, row: dict, rule: str) -> None:
+    if rule == "name":
+        row["성명"] = rng.choice(["Hong", "홍길동1", "홍 길동"])
+    elif rule == "personal_id":
+        row["주민등록번호"] = row["주민등록번호"] // 10  # 12자리
+    elif rule == "date":
+        row[rng.choice(["시작일자", "종료일자"])] = row["시작일자"][:7]  # 7자리
+    elif rule == "salary":
+        row["급여"] = 0
+    elif rule == "number":
+        row[rng.choice(_NUMBER_FIELDS)] = -rng.randint(1, 100_000)
+    else:
+        raise ValueError(f"Unknown rule: [{rule}]")
+
+
+# 시트 하나의 데이터 생성. 각 행이 위반한 검증 규칙(정상 행은 None)을 함께 반환.
+def generate_sheet(rng: random.Random, rows: int, invalid_rate: float = 0.0,
+                   year: int = 2023) -> tuple[DataFrame, list[Optional[str]]]:
+    records = []
+    rules: list[Optional[str]] = []
+    for i in range(rows):
+        row = _generate_row(rng, year)
+        rule = None
+        if rng.random() < invalid_rate:
+            rule = INVALID_RULES[rng.randrange(len(INVALID_RULES))]
+            _invalidate_row(rng, row, rule)
+        records.append(row)
+        rules.append(rule)
+    return DataFrame(records, columns=_COLUMN_NAMES), rules
+
+
+def _header_dataframe() -> DataFrame:
+    header = DataFrame([[None] * len(_COLUMN_NAMES) for _ in range(_HEADER_ROWS)], columns=_COLUMN_NAMES)
+    header.iloc[0, 0] = _TITLE
+    header.iloc[3] = _COLUMN_NAMES
+    return header
+
+
+# Macro 가 읽는 형식(6행 머리글 + 22열)으로 엑셀 파일 생성. 같은 seed 는 같은 데이터를 생성.
+# 시트 이름별로 각 행이 위반한 검증 규칙 목록을 반환.
+def generate_workbook(path: str, rows_per_sheet: int = 1000, sheet_count: int = 1, invalid_rate: float = 0.0,
+                      seed: int = 0, year: int = 2023) -> dict[str, list[Optional[str]]]:
+    rng = random.Random(seed)
+    header = _header_dataframe()
+    result: dict[str, list[Optional[str]]] = {}
+    with pandas.ExcelWriter(path, engine="openpyxl") as writer:
+        for n in range(1, sheet_count + 1):
+            sheet_name = f"Sheet{n}"
+            data, rules = generate_sheet(rng, rows_per_sheet, invalid_rate, year)
+            header.to_excel(writer, sheet_name=sheet_name, header=False, index=False)
+            data.to_excel(writer, sheet_name=sheet_name, header=False, index=False, startrow=_HEADER_ROWS)
+            result[sheet_name] = rules
+            logging.info(f"시트 생성 : [{sheet_name}] {rows_per_sheet}행, 오류 행 {sum(r is not None for r in rules)}개")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="테스트용 근로소득 엑셀 파일 생성")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=1000, help="시트별 행 수")
+    parser.add_argument("--sheets", type=int, default=1, help="시트 수")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="검증 오류 행 비율 (0~1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--year", type=int, default=2023)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    generate_workbook(args.path, args.rows, args.sheets, args.invalid_rate, args.seed, args.year)
@@ -3,16 +3,25 @@ import os
 import shutil
 import subprocess
 import sys
+from concurrent.futures import Future
+from datetime import datetime
 from typing import Optional
 
 from PySide6 import QtCore, QtWidgets
 from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout
 from pandas import ExcelFile
 
-from hometax_macro_simple.macro import Macro
+from hometax_macro_simple.macro import Job, Macro, MacroQueue
+from hometax_macro_simple.pipeline import StartupPipeline, Stage, Status
+from hometax_macro_simple.selection import RowIndex, parse_personal_ids, parse_row_numbers, read_error_report
+from hometax_macro_simple.session import SessionMonitor
 from hometax_macro_simple.webdriver import is_supported, WebDriverManager
 
 _LOG_LEVEL = logging.INFO
+_ALL_SHEETS = "(모든 시트)"
+_SELECT_ERROR_REPORT = "오류 파일"
+_SELECT_ROW_NUMBERS = "행 번호"
+_SELECT_PERSONAL_IDS = "주민등록번호"
 
 
 # 위젯 선언
@@ -23,6 +32,13 @@ class MyWidget(QtWidgets.QWidget):
         self.file_name: str = ""
         self.selected_sheet_name: str = ""
         self.exel_file: Optional[ExcelFile] = None
+        self.selected_rows: Optional[list[int]] = None  # 선택한 행 위치. None 이면 전체 행 진행.
+        self.session: SessionMonitor = SessionMonitor(webdriver)
+        # 준비 단계 상태는 작업 스레드에서 전달되므로 시그널로 화면에 반영.
+        self.stage_signal = _StageSignal()
+        self.stage_signal.changed.connect(self.show_stage)
+        self.pipeline: StartupPipeline = StartupPipeline(webdriver, self.stage_signal.changed.emit)
+        self.queue: MacroQueue = MacroQueue(webdriver, self.session)
 
         # 전체 세로 배치용 레이아웃
         self.layout: QVBoxLayout = QtWidgets.QVBoxLayout(self)
@@ -37,6 +53,20 @@ class MyWidget(QtWidgets.QWidget):
         self.layout.addWidget(self.check_browser_button)
         self.check_browser_button.clicked.connect(self.check_browser)
 
+        # "세션 유지" 체크박스
+        self.keep_alive_checkbox = QtWidgets.QCheckBox("세션 유지 (대기 중 주기적으로 홈텍스에 요청)")
+        self.layout.addWidget(self.keep_alive_checkbox)
+        self.keep_alive_checkbox.toggled.connect(self.toggle_keep_alive)
+
+        # "알림창 가로채기" 체크박스
+        self.alert_hook_checkbox = QtWidgets.QCheckBox("알림창 가로채기 (실험적 기능, 알림창을 기다리지 않고 바로 응답)")
+        self.layout.addWidget(self.alert_hook_checkbox)
+        self.alert_hook_checkbox.toggled.connect(self.toggle_alert_hook)
+
+        # "명령 기록" 체크박스
+        self.trace_checkbox = QtWidgets.QCheckBox("웹드라이버 명령 기록 (바탕화면에 저장)")
+        self.layout.addWidget(self.trace_checkbox)
+
         # 파일 관련 버튼을 위한 수평 레이아웃
         self.fileLayout = QtWidgets.QHBoxLayout()
         # "파일 불러오기" 버튼
@@ -53,11 +83,47 @@ class MyWidget(QtWidgets.QWidget):
         # 파일 관련 버튼과 파일 이름 표시 영역을 메인 레이아웃에 추가
         self.layout.addLayout(self.fileLayout)
 
+        # 행 선택: 오류 파일, 행 번호, 주민등록번호로 다시 진행할 행만 선택
+        self.rowLayout = QtWidgets.QHBoxLayout()
+        self.select_rows_button = QtWidgets.QPushButton("행 선택")
+        self.clear_rows_button = QtWidgets.QPushButton("행 선택 해제")
+        self.selected_rows_label = QtWidgets.QLabel("전체 행 진행")
+        self.rowLayout.addWidget(self.select_rows_button)
+        self.rowLayout.addWidget(self.clear_rows_button)
+        self.rowLayout.addWidget(self.selected_rows_label)
+        self.select_rows_button.clicked.connect(self.select_rows)
+        self.clear_rows_button.clicked.connect(self.clear_rows)
+        self.layout.addLayout(self.rowLayout)
+
+        # 준비 단계 상태 표시 영역
+        self.stageLayout = QtWidgets.QHBoxLayout()
+        self.stage_labels: dict[Stage, QtWidgets.QLabel] = {}
+        for stage in Stage:
+            label = QtWidgets.QLabel(f"{stage.value}: {Status.IDLE.value}")
+            self.stage_labels[stage] = label
+            self.stageLayout.addWidget(label)
+        self.layout.addLayout(self.stageLayout)
+
         # "매크로 시작" 버튼
         self.start_macro_button = QtWidgets.QPushButton("매크로 시작")
         self.layout.addWidget(self.start_macro_button)
         self.start_macro_button.clicked.connect(self.start_macro)
 
+        # 작업 대기열: 여러 파일, 시트를 같은 브라우저에서 차례로 처리
+        self.queueLayout = QtWidgets.QHBoxLayout()
+        self.add_job_button = QtWidgets.QPushButton("작업 추가")
+        self.remove_job_button = QtWidgets.QPushButton("작업 제거")
+        self.start_queue_button = QtWidgets.QPushButton("대기열 실행")
+        self.queueLayout.addWidget(self.add_job_button)
+        self.queueLayout.addWidget(self.remove_job_button)
+        self.queueLayout.addWidget(self.start_queue_button)
+        self.add_job_button.clicked.connect(self.add_job)
+        self.remove_job_button.clicked.connect(self.remove_job)
+        self.start_queue_button.clicked.connect(self.start_queue)
+        self.layout.addLayout(self.queueLayout)
+        self.job_list = QtWidgets.QListWidget()
+        self.layout.addWidget(self.job_list)
+
         # "근로소득 지급명세서 제출 바로가기" 버튼 추가
         # self.shortcut_1_button = QtWidgets.QPushButton("근로소득 지급명세서 제출 바로가기")
         # self.layout.addWidget(self.shortcut_1_button)
@@ -84,12 +150,34 @@ class MyWidget(QtWidgets.QWidget):
 
         logging.info("프로그램이 시작되었습니다.")
         self.check_browser()
+        # 드라이버 확인은 입력이 필요 없으므로 바로 시작.
+        self.pipeline.resolve_driver()
 
     @QtCore.Slot()
     def open(self):
-        self.webdriver.close()
-        self.webdriver.create()
-        self.webdriver.control().open()
+        self.session.stop_keep_alive()
+        browser = self.pipeline.open_browser()
+        if self.keep_alive_checkbox.isChecked():
+            browser.add_done_callback(self._start_keep_alive_after_open)
+
+    def _start_keep_alive_after_open(self, browser: Future) -> None:
+        if browser.exception() is None:
+            self.session.start_keep_alive()
+
+    @QtCore.Slot(object, object)
+    def show_stage(self, stage: Stage, status: Status):
+        self.stage_labels[stage].setText(f"{stage.value}: {status.value}")
+
+    @QtCore.Slot(bool)
+    def toggle_keep_alive(self, checked: bool):
+        if checked:
+            self.session.start_keep_alive()
+        else:
+            self.session.stop_keep_alive()
+
+    @QtCore.Slot(bool)
+    def toggle_alert_hook(self, checked: bool):
+        self.webdriver.set_alert_hook(checked)
 
     @QtCore.Slot()
     def check_browser(self):
@@ -102,6 +190,11 @@ class MyWidget(QtWidgets.QWidget):
     @QtCore.Slot()
     def load_file(self):
         file_name, _ = QtWidgets.QFileDialog.getOpenFileName(self, "파일 불러오기", "", "Excel Files (*.xls *.xlsx)")
+        self.pipeline.unload_sheet()
+        self.clear_rows()
+        if self.exel_file:
+            self.exel_file.close()
+            self.exel_file = None
         if file_name:
             self.file_name = file_name
             # 엑셀 파일을 열고 시트 이름 목록을 가져옴.
@@ -113,6 +206,8 @@ class MyWidget(QtWidgets.QWidget):
             if ok and sheet:
                 self.selected_sheet_name = sheet  # 선택된 시트 이름 저장
                 self.file_name_label.setText(f"선택된 파일: {self.file_name} ({self.selected_sheet_name})")
+                # 매크로 시작 전에 미리 시트 읽기와 사전 검증 진행.
+                self.pipeline.load_sheet(self.exel_file, self.selected_sheet_name)
             else:
                 self.selected_sheet_name = ""  # 선택이 취소된 경우
                 self.exel_file.close()
@@ -123,12 +218,11 @@ class MyWidget(QtWidgets.QWidget):
             self.file_name = ""
             self.selected_sheet_name = ""  # 파일 선택이 취소된 경우
             self.file_name_label.setText("선택된 파일 없음")
-            if self.exel_file:
-                self.exel_file.close()
-            self.exel_file = None
 
     @QtCore.Slot()
     def unload_file(self):
+        self.pipeline.unload_sheet()
+        self.clear_rows()
         self.file_name = ""
         self.selected_sheet_name = ""
         self.file_name_label.setText("선택된 파일 없음")
@@ -139,25 +233,135 @@ class MyWidget(QtWidgets.QWidget):
     @QtCore.Slot()
     def start_macro(self):
         logging.info("매크로 시작")
-        macro = Macro(self.webdriver, self.file_name, self.selected_sheet_name)
-        macro.start()
-
-        # 에러 데이터를 엑셀 파일로 저장
-        error_data = macro.get_error_dataframe()
-        # 파일 이름 설정
-        base_file_name = os.path.splitext(os.path.basename(self.file_name))[0] + '_' + self.selected_sheet_name
-        # 홈 폴더의 바탕화면 경로 설정
-        desktop_path = os.path.join(os.path.expanduser('~'), 'Desktop')
-        # TODO: 파일 이름에 시간 추가
-        output_file_path = os.path.join(desktop_path, "오류사항_" + base_file_name + ".xlsx")
-
-        # 에러 데이터프레임을 엑셀 파일로 저장
-        logging.info(f"에러 데이터를 저장합니다: {output_file_path}")
-        error_data.to_excel(output_file_path, index=False)
+        # 브라우저 실행, 시트 읽기가 진행 중이면 완료될 때까지 대기.
+        dataframe = self.pipeline.wait_ready()
+        macro = Macro(self.webdriver, self.file_name, self.selected_sheet_name, self.session, dataframe,
+                      self.selected_rows)
+        self.start_trace(self.file_name, self.selected_sheet_name)
+        try:
+            macro.start()
+        finally:
+            self.webdriver.stop_trace()
+
+        output_file_path = save_error_file(macro, self.file_name, self.selected_sheet_name)
 
         # 사용자에게 저장 완료 알림
         QtWidgets.QMessageBox.information(self, "저장 완료", f"에러 데이터가 저장되었습니다:\n{output_file_path}")
 
+    # 불러온 시트에서 다시 진행할 행 선택.
+    @QtCore.Slot()
+    def select_rows(self):
+        dataframe = self.pipeline.wait_sheet()
+        if dataframe is None:
+            logging.info("행 선택 : 불러온 파일이 없습니다.")
+            return
+        method, ok = QtWidgets.QInputDialog.getItem(
+            self, "행 선택", "선택 방법:", [_SELECT_ERROR_REPORT, _SELECT_ROW_NUMBERS, _SELECT_PERSONAL_IDS], 0, False)
+        if not (ok and method):
+            return
+
+        index = RowIndex(dataframe)
+        try:
+            if method == _SELECT_ERROR_REPORT:
+                file_name, _ = QtWidgets.QFileDialog.getOpenFileName(self, "오류 파일 선택", get_desktop_path(),
+                                                                     "Excel Files (*.xls *.xlsx)")
+                if not file_name:
+                    return
+                positions, missing = index.find_error_report(read_error_report(file_name))
+                if missing:
+                    logging.info(f"행 선택 : 원본 시트에서 찾지 못한 오류 파일 행 {len(missing)}개. {missing}")
+            elif method == _SELECT_ROW_NUMBERS:
+                text, ok = QtWidgets.QInputDialog.getText(self, "행 선택", "행 번호 (데이터 첫 행이 1, 예: 1-30, 45):")
+                if not (ok and text):
+                    return
+                positions = index.find_row_numbers(parse_row_numbers(text))
+            else:
+                text, ok = QtWidgets.QInputDialog.getMultiLineText(self, "행 선택", "주민등록번호 (줄바꿈 또는 쉼표로 구분):")
+                if not (ok and text):
+                    return
+                positions, missing = index.find_personal_ids(parse_personal_ids(text))
+                if missing:
+                    logging.info(f"행 선택 : 원본 시트에서 찾지 못한 주민등록번호 {len(missing)}개.")
+        except ValueError as e:
+            QtWidgets.QMessageBox.warning(self, "행 선택", str(e))
+            return
+
+        self.selected_rows = positions
+        self.selected_rows_label.setText(f"선택된 행: {len(positions)}/{index.row_count} ({method})")
+        logging.info(f"행 선택 : {method}, 전체 {index.row_count}행 중 {len(positions)}행.")
+
+    @QtCore.Slot()
+    def clear_rows(self):
+        self.selected_rows = None
+        self.selected_rows_label.setText("전체 행 진행")
+
+    @QtCore.Slot()
+    def add_job(self):
+        file_name, _ = QtWidgets.QFileDialog.getOpenFileName(self, "작업 추가", "", "Excel Files (*.xls *.xlsx)")
+        if not file_name:
+            return
+        with ExcelFile(file_name) as excel_file:
+            sheet_names = excel_file.sheet_names
+
+        sheet, ok = QtWidgets.QInputDialog.getItem(self, "시트 선택", "시트:", [_ALL_SHEETS] + sheet_names, 0, False)
+        if not (ok and sheet):
+            return
+        selected_sheet_names = sheet_names if sheet == _ALL_SHEETS else [sheet]
+        # 실행 전에 미리 시트를 읽음.
+        sheets = self.pipeline.parse_sheets(file_name, selected_sheet_names)
+        for sheet_name in selected_sheet_names:
+            self.queue.add(file_name, sheet_name, sheets)
+            self.job_list.addItem(f"{os.path.basename(file_name)} ({sheet_name})")
+
+    @QtCore.Slot()
+    def remove_job(self):
+        row = self.job_list.currentRow()
+        if row < 0:
+            return
+        self.queue.remove(row)
+        self.job_list.takeItem(row)
+
+    @QtCore.Slot()
+    def start_queue(self):
+        if not self.queue.jobs:
+            logging.info("대기열에 작업이 없습니다.")
+            return
+        logging.info(f"대기열 시작 : 작업 {len(self.queue.jobs)}개")
+        self.pipeline.wait_browser()
+        try:
+            self.queue.start(self._on_job_start, self._on_job_done)
+        finally:
+            self.webdriver.stop_trace()
+
+        # 전체 작업 요약을 엑셀 파일로 저장
+        summary = self.queue.get_summary_dataframe()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file_path = os.path.join(get_desktop_path(), f"작업요약_{timestamp}.xlsx")
+        logging.info(f"작업 요약을 저장합니다: {output_file_path}")
+        summary.to_excel(output_file_path, index=False)
+
+        self.queue.clear()
+        self.job_list.clear()
+        QtWidgets.QMessageBox.information(self, "저장 완료", f"작업 요약이 저장되었습니다:\n{output_file_path}")
+
+    def _on_job_start(self, job: Job) -> None:
+        self.start_trace(job.path, job.sheet_name)
+
+    def _on_job_done(self, job: Job) -> None:
+        self.webdriver.stop_trace()
+        item = self.job_list.item(self.queue.jobs.index(job))
+        item.setText(f"{item.text()} - {job.status}")
+        if job.macro is not None:
+            save_error_file(job.macro, job.path, job.sheet_name)
+
+    # '명령 기록' 체크시 바탕화면에 웹드라이버 명령 기록 시작.
+    def start_trace(self, file_name: str, sheet_name: str) -> None:
+        if not self.trace_checkbox.isChecked():
+            return
+        base_file_name = get_output_base_name(file_name, sheet_name)
+        trace_file_path = os.path.join(get_desktop_path(), "명령기록_" + base_file_name + ".jsonl")
+        self.webdriver.start_trace(trace_file_path, {"file": file_name, "sheet": sheet_name})
+
     @QtCore.Slot()
     def show_example(self):
         example_path = get_example_file_path()
@@ -184,6 +388,29 @@ class MyWidget(QtWidgets.QWidget):
             QtWidgets.QMessageBox.information(self, "저장 완료", f"예시 파일이 저장되었습니다:\n{save_path}")
 
 
+# 결과 파일 이름. (파일 이름_시트 이름)
+def get_output_base_name(file_name: str, sheet_name: str) -> str:
+    return os.path.splitext(os.path.basename(file_name))[0] + '_' + sheet_name
+
+
+# 홈 폴더의 바탕화면 경로
+def get_desktop_path() -> str:
+    return os.path.join(os.path.expanduser('~'), 'Desktop')
+
+
+# 에러 데이터를 바탕화면에 엑셀 파일로 저장하고 경로 반환.
+def save_error_file(macro: Macro, file_name: str, sheet_name: str) -> str:
+    error_data = macro.get_error_dataframe()
+    # TODO: 파일 이름에 시간 추가
+    base_file_name = get_output_base_name(file_name, sheet_name)
+    output_file_path = os.path.join(get_desktop_path(), "오류사항_" + base_file_name + ".xlsx")
+
+    # 에러 데이터프레임을 엑셀 파일로 저장
+    logging.info(f"에러 데이터를 저장합니다: {output_file_path}")
+    error_data.to_excel(output_file_path, index=False)
+    return output_file_path
+
+
 # PyInstaller가 생성한 임시 디렉터리 경로를 얻기.
 # 애플리케이션이 PyInstaller로 패키징되지 않았다면, 현재 파일의 디렉터리를 사용.
 def get_example_file_path() -> str:
@@ -193,12 +420,23 @@ def get_example_file_path() -> str:
         return '../data/sample.xlsx'
 
 
+class _StageSignal(QtCore.QObject):
+    changed = QtCore.Signal(object, object)  # Stage, Status
+
+
+class _LogSignal(QtCore.QObject):
+    message = QtCore.Signal(str)
+
+
+# 작업 스레드의 로그도 시그널을 통해 화면 스레드에서 출력.
 class QTextEditLogger(logging.Handler):
     def __init__(self, parent):
         super().__init__()
         self.widget = QtWidgets.QPlainTextEdit(parent)
         self.widget.setReadOnly(True)
+        self.signal = _LogSignal()
+        self.signal.message.connect(self.widget.appendPlainText)
 
     def emit(self, record):
         msg = self.format(record)
-        self.widget.appendPlainText(msg)
+        self.signal.message.emit(msg)
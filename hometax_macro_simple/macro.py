@@ -1,11 +1,15 @@
 import logging
 import time
+from concurrent.futures import Future
+from typing import Callable, Optional
 
 import pandas
 from pandas import DataFrame
 
-from hometax_macro_simple.exception import InvalidDataException
+from hometax_macro_simple.exception import InvalidDataException, SessionExpiredException
 from hometax_macro_simple.record import Record
+from hometax_macro_simple.selection import select_rows
+from hometax_macro_simple.session import SessionMonitor
 from hometax_macro_simple.webdriver import WebDriverManager
 
 # 근소로득 지급명세서 제출용 (적용 내용)
@@ -61,13 +65,39 @@ _COLUMN_NAMES: list[str] = [
 
 
 class Macro:
-    def __init__(self, webdriver: WebDriverManager, path: str, selected_sheet_name: str):
+    def __init__(self, webdriver: WebDriverManager, path: str, selected_sheet_name: str,
+                 session: Optional[SessionMonitor] = None, dataframe: Optional[DataFrame] = None,
+                 rows: Optional[list[int]] = None):
         self.webdriver: WebDriverManager = webdriver
-        self.record: Record = Record(
-            pandas.read_excel(path, header=None, skiprows=6, sheet_name=selected_sheet_name))
+        self.session: SessionMonitor = session if session is not None else SessionMonitor(webdriver)
+        # 미리 읽은 시트가 있으면 다시 읽지 않음.
+        if dataframe is None:
+            dataframe = pandas.read_excel(path, header=None, skiprows=6, sheet_name=selected_sheet_name)
+        # 선택한 행 위치(0부터)가 있으면 해당 행만 원래 순서대로 진행.
+        self.selected: bool = rows is not None
+        if self.selected:
+            dataframe = select_rows(dataframe, rows)
+        self.record: Record = Record(dataframe)
+        self.row_count: int = len(dataframe)
+        self.success_count: int = 0
         self.error_data_list: list[pandas.Series] = []
+        self.completed: bool = False  # 마지막 행까지 진행했는지 여부
 
     def start(self) -> None:
+        with self.session.busy():
+            try:
+                self._start()
+            finally:
+                self._remove_alert_hook()
+
+    # 실행이 끝나면 알림창 가로채기를 해제하여 사용자가 알림창을 직접 확인할 수 있도록 함.
+    def _remove_alert_hook(self) -> None:
+        try:
+            self.webdriver.control().remove_alert_hook()
+        except Exception as e:
+            logging.info(f"알림창 가로채기 해제 실패. : [{e}]")
+
+    def _start(self) -> None:
         time.sleep(1)
         self.webdriver.control().switch_to_default_content()
 
@@ -79,15 +109,35 @@ class Macro:
 
         logging.info("메크로 반복 시작")
         i = 0
+        retry = False  # 세션 만료로 중단된 행을 재로그인 후 다시 진행.
         while True:
             time.sleep(2)
+            row_loaded = False
             try:
+                # 행 사이에서 로그아웃, 세션 만료 확인.
+                if self.session.is_expired():
+                    self.session.wait_for_login()
                 self.webdriver.control().reset()
-                i += 1
-                logging.info(f"메크로 반복 [{i}].")
-                # 레코드의 다음 행 가져오기. 레코드의 다음 행이 없으면 반복 종료.
-                if not self.record.next():
-                    break
+                if retry:
+                    retry = False
+                    logging.info(f"메크로 반복 [{i}] 재시도.")
+                else:
+                    i += 1
+                    logging.info(f"메크로 반복 [{i}].")
+                    # 레코드의 다음 행 가져오기. 레코드의 다음 행이 없으면 반복 종료.
+                    try:
+                        has_next = self.record.next()
+                    except InvalidDataException:
+                        self.webdriver.mark_row(i)  # 검증 오류 행도 명령 기록에서는 한 행으로 구분.
+                        raise
+                    if not has_next:
+                        self.completed = True
+                        break
+                # 행을 읽은 후 구분. 마지막 확인(다음 행 없음)은 행으로 세지 않음.
+                self.webdriver.mark_row(i)
+                row_loaded = True
+                if self.selected:
+                    logging.info(f"메크로 반복 [{i}] : 원본 [{self.record.get_current_series().name + 1}]행.")
                 logging.info(f"메크로 반복 [{i}].\n현재 데이터 : {self.record.get_current_data()}")
 
                 # 소득자 인적사항 단계
@@ -118,16 +168,38 @@ class Macro:
 
                 # 계산 및 추가 단계
                 self.webdriver.control().confirm_final_step()
+                self.success_count += 1
 
+            except SessionExpiredException as e:
+                logging.info(f"메크로 중단. 남은 행을 오류 데이터로 저장. : [{e}]")
+                self._append_remaining_to_error(row_loaded or retry)
+                break
             except InvalidDataException as e:
+                # 세션 만료로 인한 실패는 오류로 기록하지 않고 재로그인 후 같은 행을 다시 진행.
+                # (재시도 중 초기화 단계에서 다시 만료된 경우 포함) 만료 상태는 SessionMonitor 가 유지하므로
+                # 다음 반복 시작에서 재로그인을 기다림.
+                if (row_loaded or retry) and self.session.is_expired():
+                    retry = True
+                    continue
+                retry = False
                 logging.info(f"메크로 실행 중 데이터 오류 발생. 다음 순서로 넘김. : [{e}]")
                 self.error_data_list.append(self.record.get_current_series())
                 continue
             except Exception as e:
+                if (row_loaded or retry) and self.session.is_expired():
+                    retry = True
+                    continue
+                retry = False
                 logging.info(f"메크로 실행 중 오류 발생. 다음 순서로 넘김. : [{e}]")
                 self.error_data_list.append(self.record.get_current_series())
                 continue
 
+    # 세션 만료로 중단된 경우, 진행하지 못한 행을 오류 데이터에 추가.
+    def _append_remaining_to_error(self, include_current: bool) -> None:
+        if include_current:
+            self.error_data_list.append(self.record.get_current_series())
+        self.error_data_list.extend(self.record.remaining_series())
+
     # 에러가 발생한 데이터 확인.
     def get_error_dataframe(self) -> DataFrame:
         df_default = DataFrame(columns=_COLUMN_NAMES)
@@ -149,6 +221,92 @@ class Macro:
         return df_concat
 
 
+_JOB_PENDING: str = "대기"
+_JOB_DONE: str = "완료"
+_JOB_STOPPED: str = "중단"  # 시작 위치 오류, 세션 만료 등으로 마지막 행까지 진행하지 못함.
+_JOB_FAILED: str = "실패"  # 파일, 시트를 읽지 못함.
+_JOB_SKIPPED: str = "미실행"
+
+_SUMMARY_COLUMN_NAMES: list[str] = ["파일", "시트", "상태", "전체 행", "처리 행", "오류 행", "소요 시간(초)"]
+
+
+# 대기열의 작업 하나. (파일, 시트)
+class Job:
+    def __init__(self, path: str, sheet_name: str, sheets: Optional[Future] = None):
+        self.path: str = path
+        self.sheet_name: str = sheet_name
+        self._sheets: Optional[Future] = sheets  # 미리 읽고 있는 시트 목록. (시트 이름 -> 데이터프레임)
+        self.macro: Optional[Macro] = None
+        self.status: str = _JOB_PENDING
+        self.elapsed: float = 0.0
+
+    # 미리 읽은 시트. 없으면 None. (Macro 에서 직접 읽음)
+    def get_dataframe(self) -> Optional[DataFrame]:
+        if self._sheets is None:
+            return None
+        return self._sheets.result()[self.sheet_name]
+
+
+# 여러 파일, 시트를 같은 브라우저 세션에서 차례로 처리.
+class MacroQueue:
+    def __init__(self, webdriver: WebDriverManager, session: Optional[SessionMonitor] = None):
+        self.webdriver: WebDriverManager = webdriver
+        self.session: SessionMonitor = session if session is not None else SessionMonitor(webdriver)
+        self.jobs: list[Job] = []
+
+    def add(self, path: str, sheet_name: str, sheets: Optional[Future] = None) -> Job:
+        job = Job(path, sheet_name, sheets)
+        self.jobs.append(job)
+        return job
+
+    def remove(self, index: int) -> None:
+        del self.jobs[index]
+
+    def clear(self) -> None:
+        self.jobs = []
+
+    # 작업을 순서대로 진행. 작업이 중단되면(시작 위치 오류, 세션 만료) 나머지 작업은 진행하지 않음.
+    def start(self, on_job_start: Optional[Callable[[Job], None]] = None,
+              on_job_done: Optional[Callable[[Job], None]] = None) -> None:
+        stopped = False
+        for n, job in enumerate(self.jobs, 1):
+            if stopped:
+                job.status = _JOB_SKIPPED
+                continue
+            logging.info(f"작업 [{n}/{len(self.jobs)}] 시작 : {job.path} ({job.sheet_name})")
+            started = time.perf_counter()
+            try:
+                job.macro = Macro(self.webdriver, job.path, job.sheet_name, self.session, job.get_dataframe())
+                if on_job_start is not None:
+                    on_job_start(job)
+                job.macro.start()
+            except Exception as e:
+                logging.info(f"작업 [{n}/{len(self.jobs)}] 실패 : [{e}]")
+                job.status = _JOB_FAILED
+            else:
+                job.status = _JOB_DONE if job.macro.completed else _JOB_STOPPED
+                stopped = not job.macro.completed
+            job.elapsed = time.perf_counter() - started
+            logging.info(f"작업 [{n}/{len(self.jobs)}] {job.status} : {job.path} ({job.sheet_name})")
+            if on_job_done is not None:
+                # 결과 파일 저장 실패(파일이 열려 있음 등)로 나머지 작업이 중단되지 않도록 함.
+                try:
+                    on_job_done(job)
+                except Exception as e:
+                    logging.info(f"작업 [{n}/{len(self.jobs)}] 결과 처리 실패 : [{e}]")
+
+    # 작업별 결과 요약.
+    def get_summary_dataframe(self) -> DataFrame:
+        rows = []
+        for job in self.jobs:
+            if job.macro is None:
+                rows.append([job.path, job.sheet_name, job.status, 0, 0, 0, round(job.elapsed, 1)])
+                continue
+            rows.append([job.path, job.sheet_name, job.status, job.macro.row_count, job.macro.success_count,
+                         len(job.macro.error_data_list), round(job.elapsed, 1)])
+        return DataFrame(rows, columns=_SUMMARY_COLUMN_NAMES)
+
+
 # test
 if __name__ == "__main__":
     pass
@@ -0,0 +1,123 @@
+# 시작 준비 단계 병렬 처리.
+# 드라이버 확인, 브라우저 실행, 시트 읽기, 사전 검증을 입력이 준비되는 즉시 스레드 풀에서 동시에 진행.
+# 매크로 시작까지 걸리는 시간은 각 단계 시간의 합이 아니라 가장 오래 걸리는 단계의 시간이 됨.
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Optional
+
+import pandas
+from pandas import DataFrame, ExcelFile
+
+from hometax_macro_simple.record import preflight
+from hometax_macro_simple.webdriver import WebDriverManager, install_driver
+
+_MAX_WORKERS: int = 4
+
+
+class Stage(Enum):
+    DRIVER: str = "드라이버"
+    BROWSER: str = "브라우저"
+    SHEET: str = "시트"
+    PREFLIGHT: str = "사전 검증"
+
+
+class Status(Enum):
+    IDLE: str = "대기"
+    RUNNING: str = "진행 중"
+    DONE: str = "완료"
+    FAILED: str = "실패"
+
+
+class StartupPipeline:
+    # on_change 는 작업 스레드에서 호출됨.
+    def __init__(self, webdriver: WebDriverManager, on_change: Optional[Callable[[Stage, Status], None]] = None):
+        self.webdriver: WebDriverManager = webdriver
+        self._on_change: Callable[[Stage, Status], None] = on_change or (lambda stage, status: None)
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+        self._driver: Optional[Future[str]] = None
+        self._browser: Optional[Future[None]] = None
+        self._sheet: Optional[Future[DataFrame]] = None
+        self._preflight: Optional[Future[list[tuple[int, str]]]] = None
+
+    # 엣지 드라이버 확인 및 설치. 입력이 필요 없으므로 프로그램 시작시 바로 진행.
+    def resolve_driver(self) -> None:
+        if self._driver is None or (self._driver.done() and self._driver.exception() is not None):
+            self._driver = self._submit(Stage.DRIVER, install_driver)
+
+    # 드라이버 확인이 끝나는 대로 브라우저를 새로 열고 홈텍스 접속.
+    def open_browser(self) -> Future[None]:
+        if self._browser is not None and not self._browser.done():
+            return self._browser
+        self.resolve_driver()
+        driver = self._driver
+
+        def open_browser() -> None:
+            driver.result()
+            self.webdriver.close()
+            self.webdriver.create()
+            self.webdriver.control().open()
+
+        self._browser = self._submit(Stage.BROWSER, open_browser)
+        return self._browser
+
+    # 시트를 선택하면 바로 시트 읽기와 사전 검증 시작.
+    def load_sheet(self, excel_file: ExcelFile, sheet_name: str) -> None:
+        self.unload_sheet()
+        self._sheet = self._submit(Stage.SHEET, excel_file.parse, sheet_name, header=None, skiprows=6)
+        sheet = self._sheet
+
+        def check() -> list[tuple[int, str]]:
+            errors = preflight(sheet.result())
+            logging.info(f"사전 검증 : 전체 {len(sheet.result())}행 중 오류 {len(errors)}행. "
+                         f"{[position + 1 for position, _ in errors]}")
+            return errors
+
+        self._preflight = self._submit(Stage.PREFLIGHT, check)
+
+    # 작업 대기열에 추가된 시트를 미리 읽음. 파일은 한 번만 열어 여러 시트를 함께 읽음.
+    def parse_sheets(self, path: str, sheet_names: list[str]) -> Future[dict[str, DataFrame]]:
+        return self._executor.submit(pandas.read_excel, path, sheet_name=sheet_names, header=None, skiprows=6)
+
+    # 선택된 시트 제거. 진행 중인 시트 읽기가 끝날 때까지 기다린 후 반환. (파일을 닫기 전에 호출)
+    def unload_sheet(self) -> None:
+        for future, stage in [(self._sheet, Stage.SHEET), (self._preflight, Stage.PREFLIGHT)]:
+            if future is not None and not future.cancel():
+                future.exception()  # 완료 대기
+            self._on_change(stage, Status.IDLE)
+        self._sheet = None
+        self._preflight = None
+
+    # 브라우저 실행이 진행 중이면 끝날 때까지 대기.
+    def wait_browser(self) -> None:
+        if self._browser is not None:
+            self._browser.result()
+
+    # 시트 읽기가 끝날 때까지 기다린 후 읽은 시트 반환. 불러온 시트가 없으면 None.
+    def wait_sheet(self) -> Optional[DataFrame]:
+        if self._sheet is None:
+            return None
+        return self._sheet.result()
+
+    # 브라우저 실행과 시트 읽기가 끝날 때까지 기다린 후 읽은 시트 반환. 불러온 시트가 없으면 None.
+    # 사전 검증은 결과를 기록만 하고 매크로가 행마다 다시 검증하므로 기다리지 않음. (백그라운드에서 계속 진행)
+    def wait_ready(self) -> Optional[DataFrame]:
+        self.wait_browser()
+        return self.wait_sheet()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, stage: Stage, fn: Callable, *args, **kwargs) -> Future:
+        def run():
+            self._on_change(stage, Status.RUNNING)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                logging.info(f"{stage.value} 준비 실패. : [{e}]")
+                self._on_change(stage, Status.FAILED)
+                raise
+            self._on_change(stage, Status.DONE)
+            return result
+
+        return self._executor.submit(run)
@@ -33,6 +33,10 @@ class Record:
     def get_current_series(self) -> Series:
         return self._current_series
 
+    # 아직 읽지 않은 나머지 행을 반환. 반환 후 레코드는 더이상 행이 없음.
+    def remaining_series(self) -> list[Series]:
+        return list(self._df_generator)
+
     # 다음 행을 레코드에 초기화. 레코드는 초기 비어있는 상태로 시작. 데이터 검증실패시 False 와 함께 데이터 반환.
     def next(self) -> bool:
         try:
@@ -73,6 +77,21 @@ class Record:
         return int(self._data["salary"]) < 41470589
 
 
+# 전체 행 사전 검증. 검증에 실패한 행의 위치(0부터)와 오류 메시지 목록을 반환.
+def preflight(dataframe: DataFrame) -> list[tuple[int, str]]:
+    record = Record(dataframe)
+    errors = []
+    position = 0
+    while True:
+        try:
+            if not record.next():
+                break
+        except InvalidDataException as e:
+            errors.append((position, str(e)))
+        position += 1
+    return errors
+
+
 def _df_row_generator(dataframe: DataFrame) -> Iterator[Series]:
     for _, row in dataframe.iterrows():
         yield row
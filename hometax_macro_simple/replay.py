@@ -0,0 +1,145 @@
+# 기록된 웹드라이버 명령 재생.
+# 기록 파일의 응답을 돌려주는 가짜 드라이버로 현재 매크로 코드를 실행하여,
+# 브라우저 없이 클라이언트 측 처리 시간과 행별 명령(왕복) 횟수를 측정하고 기록 당시와 비교.
+import argparse
+import json
+import logging
+import sys
+import time
+from collections import deque
+from typing import Optional
+from unittest import mock
+
+from selenium import webdriver
+
+from hometax_macro_simple.macro import Macro
+from hometax_macro_simple.session import SessionMonitor
+from hometax_macro_simple.trace import TraceRecorder, expand_value, read_trace, summarize
+from hometax_macro_simple.webdriver import _Control
+
+_SESSION_ID: str = "replay"
+_FIND_COMMANDS: list[str] = ["findElement", "findElements", "findChildElement", "findChildElements"]
+_SCRIPT_COMMANDS: list[str] = ["w3cExecuteScript", "w3cExecuteScriptAsync"]
+
+
+# 기록된 응답을 명령별 순서대로 돌려주는 명령 실행기. 기록이 모자라면 마지막 응답을 반복.
+class _TraceExecutor:
+    def __init__(self, records: list[dict]):
+        self._responses: dict[tuple, deque[dict]] = {}
+        self._last: dict[tuple, dict] = {}
+        self.unmatched: dict[str, int] = {}  # 기록에 없는 명령
+        for record in records:
+            if "c" in record:
+                self._responses.setdefault(_command_key(record["c"], record.get("p")), deque()).append(record)
+
+    def execute(self, command: str, params: Optional[dict] = None) -> dict:
+        if command == "newSession":
+            return {"value": {"sessionId": _SESSION_ID, "capabilities": {"browserName": "msedge"}}}
+        key = _command_key(command, params)
+        queue = self._responses.get(key)
+        if queue:
+            self._last[key] = queue.popleft()
+        record = self._last.get(key)
+        if record is None:
+            self.unmatched[command] = self.unmatched.get(command, 0) + 1
+            return {"value": None}
+        if "e" in record:
+            return {"status": record["e"], "value": {"error": record["e"], "message": "replay"}}
+        return {"value": expand_value(record.get("r"))}
+
+    def close(self) -> None:
+        pass
+
+
+class _ReplayManager:
+    def __init__(self, driver: webdriver.Remote, recorder: TraceRecorder, alert_hook: bool = False):
+        self.driver: webdriver.Remote = driver
+        self.recorder: TraceRecorder = recorder
+        self.alert_hook: bool = alert_hook  # 기록 당시 알림창 가로채기 사용 여부
+
+    def control(self):
+        return _Control(self.driver, self.alert_hook)
+
+    def mark_row(self, row: int) -> None:
+        self.recorder.mark_row(row)
+
+
+def _command_key(command: str, params: Optional[dict]) -> tuple:
+    params = params or {}
+    if command in _FIND_COMMANDS:
+        return command, params.get("using"), params.get("value")
+    if command in _SCRIPT_COMMANDS:
+        return command, params.get("script")
+    return (command,)
+
+
+def _average_per_row(summary: dict) -> float:
+    counts = [count for row, count in summary["per_row"].items() if row > 0]
+    return round(sum(counts) / len(counts), 1) if counts else 0.0
+
+
+# 기록 파일을 현재 매크로 코드로 재생. 파일, 시트를 지정하지 않으면 기록 파일에 저장된 값 사용.
+# 행별 평균 명령 수가 기록 당시보다 tolerance 비율 이상 늘어나면 regression 으로 표시.
+def replay(trace_path: str, path: Optional[str] = None, sheet_name: Optional[str] = None,
+           tolerance: float = 0.0) -> dict:
+    records = read_trace(trace_path)
+    header = records[0] if records and "trace" in records[0] else {}
+    path = path or header.get("file")
+    sheet_name = sheet_name or header.get("sheet")
+    if not path or not sheet_name:
+        raise ValueError("재생할 엑셀 파일과 시트를 지정해야 합니다.")
+
+    executor = _TraceExecutor(records)
+    driver = webdriver.Remote(command_executor=executor, options=webdriver.EdgeOptions())
+    recorder = TraceRecorder()
+    recorder.attach(driver)
+    manager = _ReplayManager(driver, recorder, header.get("alert_hook", False))
+    macro = Macro(manager, path, sheet_name, SessionMonitor(manager, check_interval=0, resume_timeout=1))
+
+    # 고정 대기 시간은 건너뛰고 합계만 기록.
+    slept = [0.0]
+
+    def sleep(seconds: float) -> None:
+        slept[0] += seconds
+
+    with mock.patch("time.sleep", side_effect=sleep):
+        started = time.perf_counter()
+        macro.start()
+        elapsed = time.perf_counter() - started
+    recorder.detach()
+
+    recorded = summarize(records)
+    replayed = summarize(recorder.records)
+    recorded_average = _average_per_row(recorded)
+    replayed_average = _average_per_row(replayed)
+    rows = max(replayed["rows"], 1)
+    return {
+        "rows": replayed["rows"],
+        "commands": replayed["commands"],
+        "recorded_commands_per_row": recorded_average,
+        "replayed_commands_per_row": replayed_average,
+        "recorded_round_trip_ms_per_row": round(recorded["round_trip_ms"] / max(recorded["rows"], 1), 1),
+        "client_ms_per_row": round(elapsed * 1000 / rows, 3),
+        "client_us_per_command": round(elapsed * 1_000_000 / max(replayed["commands"], 1), 1),
+        "sleep_s_per_row": round(slept[0] / rows, 1),
+        "added_commands": {command: count - recorded["by_command"].get(command, 0)
+                           for command, count in replayed["by_command"].items()
+                           if count > recorded["by_command"].get(command, 0)},
+        "unmatched_commands": executor.unmatched,
+        "regression": replayed_average > recorded_average * (1 + tolerance),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="웹드라이버 명령 기록 재생")
+    parser.add_argument("trace")
+    parser.add_argument("--file", help="엑셀 파일 (기본값: 기록 파일에 저장된 경로)")
+    parser.add_argument("--sheet", help="시트 이름 (기본값: 기록 파일에 저장된 시트)")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="허용하는 행별 명령 수 증가 비율")
+    args = parser.parse_args()
+
+    # browsers 모듈이 import 시 루트 로거에 INFO 출력을 설정하므로 덮어씀. (행 데이터가 보고서에 섞이지 않도록)
+    logging.basicConfig(level=logging.WARNING, force=True)
+    report = replay(args.trace, args.file, args.sheet, args.tolerance)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(1 if report["regression"] else 0)
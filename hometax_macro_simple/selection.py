@@ -0,0 +1,111 @@
+# 선택한 행만 다시 실행.
+# 이전 작업의 오류 파일(오류사항_*.xlsx), 행 번호 범위, 주민등록번호 목록으로 원본 시트의 행을 찾아
+# 해당 행만 원래 순서대로 남긴 데이터프레임을 만듦. 행 번호는 데이터 첫 행(엑셀 7행)이 1.
+import logging
+import re
+from typing import Any, Iterable
+
+import pandas
+from pandas import DataFrame
+
+_NAME_COLUMN: str = "성명"
+_PERSONAL_ID_COLUMN: str = "주민등록번호"
+_SEPARATOR_PATTERN: str = r"[,\s]+"
+
+
+# 원본 시트의 (성명, 주민등록번호) -> 행 위치(0부터) 색인.
+class RowIndex:
+    def __init__(self, dataframe: DataFrame):
+        self.row_count: int = len(dataframe)
+        self._by_personal_id: dict[str, list[int]] = {}
+        self._by_name_and_personal_id: dict[tuple[str, str], list[int]] = {}
+        for position, (name, personal_id) in enumerate(zip(dataframe.iloc[:, 0], dataframe.iloc[:, 1])):
+            personal_id = _normalize_personal_id(personal_id)
+            self._by_personal_id.setdefault(personal_id, []).append(position)
+            self._by_name_and_personal_id.setdefault((_normalize_name(name), personal_id), []).append(position)
+
+    # 주민등록번호가 일치하는 행 위치와 찾지 못한 주민등록번호 목록을 반환.
+    def find_personal_ids(self, personal_ids: Iterable[Any]) -> tuple[list[int], list[str]]:
+        positions = set()
+        missing = []
+        for personal_id in personal_ids:
+            personal_id = _normalize_personal_id(personal_id)
+            found = self._by_personal_id.get(personal_id)
+            if found is None:
+                missing.append(personal_id)
+            else:
+                positions.update(found)
+        return sorted(positions), missing
+
+    # 오류 파일의 행과 성명, 주민등록번호가 모두 일치하는 행 위치와 찾지 못한 행(오류 파일의 행 번호, 1부터) 목록을 반환.
+    # 주민등록번호가 잘못되어 오류가 난 행도 원본과 같은 값이 기록되므로 찾을 수 있음.
+    def find_error_report(self, report: DataFrame) -> tuple[list[int], list[int]]:
+        positions = set()
+        missing = []
+        for n, (name, personal_id) in enumerate(zip(report[_NAME_COLUMN], report[_PERSONAL_ID_COLUMN]), 1):
+            found = self._by_name_and_personal_id.get((_normalize_name(name), _normalize_personal_id(personal_id)))
+            if found is None:
+                missing.append(n)
+            else:
+                positions.update(found)
+        return sorted(positions), missing
+
+    # 행 번호(1부터)를 행 위치로 변환. 범위를 벗어나면 ValueError.
+    def find_row_numbers(self, row_numbers: Iterable[int]) -> list[int]:
+        positions = set()
+        for row_number in row_numbers:
+            if not 1 <= row_number <= self.row_count:
+                raise ValueError(f"행 번호가 범위를 벗어났습니다. (1 ~ {self.row_count}) [{row_number}]")
+            positions.add(row_number - 1)
+        return sorted(positions)
+
+
+# 오류 파일 읽기. 성명, 주민등록번호 열이 없으면 ValueError.
+def read_error_report(path: str) -> DataFrame:
+    report = pandas.read_excel(path)
+    for column in [_NAME_COLUMN, _PERSONAL_ID_COLUMN]:
+        if column not in report.columns:
+            raise ValueError(f"오류 파일 형식이 아닙니다. [{column}] 열이 없습니다. : [{path}]")
+    return report
+
+
+# "1-30, 45 47" 형식의 행 번호 목록 해석.
+def parse_row_numbers(text: str) -> list[int]:
+    row_numbers = []
+    for token in re.split(_SEPARATOR_PATTERN, text.strip()):
+        if not token:
+            continue
+        match = re.fullmatch(r"(\d+)(?:-(\d+))?", token)
+        if match is None:
+            raise ValueError(f"행 번호 형식이 잘못되었습니다. [{token}]")
+        first = int(match.group(1))
+        last = int(match.group(2) or first)
+        if first > last:
+            raise ValueError(f"행 번호 범위가 잘못되었습니다. [{token}]")
+        row_numbers.extend(range(first, last + 1))
+    return row_numbers
+
+
+# 쉼표, 공백, 줄바꿈으로 구분된 주민등록번호 목록 해석. ("-" 는 무시)
+def parse_personal_ids(text: str) -> list[str]:
+    return [token for token in re.split(_SEPARATOR_PATTERN, text.replace("-", "").strip()) if token]
+
+
+# 선택한 행 위치만 원래 순서대로 남긴 데이터프레임. 행 이름(index)은 원본 시트의 위치를 유지.
+def select_rows(dataframe: DataFrame, positions: Iterable[int]) -> DataFrame:
+    positions = sorted(set(positions))
+    logging.info(f"선택 행 : 전체 {len(dataframe)}행 중 {len(positions)}행. {[position + 1 for position in positions]}")
+    return dataframe.iloc[positions]
+
+
+def _normalize_name(name: Any) -> str:
+    return "" if pandas.isna(name) else str(name).strip()
+
+
+# 엑셀에서 숫자로 읽힌 주민등록번호(정수, 실수)와 문자열을 같은 형식으로 변환.
+def _normalize_personal_id(personal_id: Any) -> str:
+    if pandas.isna(personal_id):
+        return ""
+    if isinstance(personal_id, float) and personal_id.is_integer():
+        return str(int(personal_id))
+    return str(personal_id).strip().replace("-", "")
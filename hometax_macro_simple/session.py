@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from hometax_macro_simple.exception import SessionExpiredException
+from hometax_macro_simple.webdriver import WebDriverManager
+
+_CHECK_INTERVAL: float = 5  # 재로그인 확인 주기(초)
+_RESUME_TIMEOUT: float = 30 * 60  # 재로그인 대기 제한 시간(초)
+_KEEP_ALIVE_INTERVAL: float = 5 * 60  # 세션 유지 요청 주기(초)
+
+
+# 로그아웃, 세션 만료 감지 및 세션 유지.
+class SessionMonitor:
+    def __init__(self, webdriver: WebDriverManager,
+                 check_interval: float = _CHECK_INTERVAL,
+                 resume_timeout: float = _RESUME_TIMEOUT,
+                 keep_alive_interval: float = _KEEP_ALIVE_INTERVAL):
+        self.webdriver: WebDriverManager = webdriver
+        self.check_interval: float = check_interval
+        self.resume_timeout: float = resume_timeout
+        self.keep_alive_interval: float = keep_alive_interval
+        # 매크로가 브라우저를 사용하는 동안에는 세션 유지 요청을 보내지 않음. (알림창 처리와 충돌 방지)
+        self._busy_lock: threading.Lock = threading.Lock()
+        self._keep_alive_stop: threading.Event = threading.Event()
+        self._keep_alive_thread: Optional[threading.Thread] = None
+        # 세션 만료 알림창을 받았지만 아직 작업 페이지에 머물러 있음.
+        # 작업 페이지를 벗어났다가(재로그인) 돌아올 때까지 만료 상태를 유지.
+        self._expired_on_page: bool = False
+
+    # 매크로가 브라우저를 사용하는 구간. 이전 실행에서 남은 만료 상태는 초기화. (실행 사이의 재로그인)
+    @contextmanager
+    def busy(self) -> Iterator[None]:
+        with self._busy_lock:
+            self._expired_on_page = False
+            yield
+
+    # 로그아웃 또는 세션 만료 여부.
+    def is_expired(self) -> bool:
+        try:
+            control = self.webdriver.control()
+            if control.accept_session_expired_alert():
+                self._expired_on_page = True
+                return True
+            if not control.is_working_page():
+                self._expired_on_page = False
+                return True
+            return self._expired_on_page
+        except Exception as e:
+            logging.info(f"세션 확인 중 오류 발생. : [{e}]")
+            return True
+
+    # 재로그인 후 작업 페이지로 돌아올 때까지 대기. 제한 시간을 넘기면 SessionExpiredException 발생.
+    def wait_for_login(self) -> None:
+        logging.info("로그아웃 또는 세션 만료 감지. 매크로 일시 정지. "
+                     "다시 로그인 후 '근로소득 지급명세서 제출' 페이지로 이동하면 이어서 진행합니다.")
+        # 재로그인은 사용자가 직접 진행하므로 알림창 가로채기 해제. (다음 행 시작시 다시 설치)
+        try:
+            self.webdriver.control().remove_alert_hook()
+        except Exception as e:
+            logging.info(f"알림창 가로채기 해제 실패. : [{e}]")
+        if self._expired_on_page:
+            logging.info("세션 만료 알림 후 작업 페이지에 머물러 있음. 다시 로그인한 후 작업 페이지로 이동해야 재개합니다.")
+        deadline = time.monotonic() + self.resume_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.check_interval)
+            if not self.is_expired():
+                logging.info("재로그인 확인. 매크로 재개.")
+                return
+        self._expired_on_page = False
+        raise SessionExpiredException(f"재로그인 대기 시간 초과. [{self.resume_timeout}초]")
+
+    # 세션 유지 요청 시작. 브라우저가 유휴 상태일 때만 주기적으로 요청을 보냄.
+    def start_keep_alive(self) -> None:
+        if self._keep_alive_thread is not None:
+            return
+        self._keep_alive_stop.clear()
+        self._keep_alive_thread = threading.Thread(target=self._keep_alive_loop, daemon=True)
+        self._keep_alive_thread.start()
+        logging.info(f"세션 유지 시작. [{self.keep_alive_interval}초 간격]")
+
+    def stop_keep_alive(self) -> None:
+        if self._keep_alive_thread is None:
+            return
+        self._keep_alive_stop.set()
+        self._keep_alive_thread.join()
+        self._keep_alive_thread = None
+        logging.info("세션 유지 중지.")
+
+    def _keep_alive_loop(self) -> None:
+        while not self._keep_alive_stop.wait(self.keep_alive_interval):
+            if not self._busy_lock.acquire(blocking=False):
+                continue  # 매크로 실행 중. 매크로의 요청이 세션을 유지함.
+            try:
+                self.webdriver.control().keep_alive()
+            except Exception as e:
+                logging.info(f"세션 유지 요청 실패. : [{e}]")
+            finally:
+                self._busy_lock.release()
@@ -0,0 +1,182 @@
+# 웹드라이버 명령 기록.
+# 셀레니움 드라이버가 msedgedriver 로 보내는 모든 명령(요소 찾기, 클릭, 입력, 스크립트 실행, 알림창 처리 등)을
+# 시간, 결과와 함께 한 줄에 하나씩 JSON 으로 기록. 행 구분 표시를 함께 남겨 행별 왕복 횟수를 확인할 수 있음.
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, TextIO
+
+_TRACE_VERSION: int = 1
+_ELEMENT_KEY: str = "element-6066-11e4-a52e-4f735466cecf"
+_MAX_TEXT_LENGTH: int = 200
+
+
+class TraceRecorder:
+    def __init__(self, path: Optional[str] = None, meta: Optional[dict] = None):
+        self.path: Optional[str] = path
+        # 파일 경로가 없으면 메모리에 기록. (재생 등)
+        self.records: list[dict] = []
+        self._file: Optional[TextIO] = open(path, "w", encoding="utf-8") if path else None
+        self._start: float = time.perf_counter()
+        self._executor: Any = None
+        self._write({"trace": _TRACE_VERSION, "created": datetime.now().isoformat(timespec="seconds"), **(meta or {})})
+
+    # 드라이버의 명령 실행기를 감싸 모든 명령을 기록.
+    def attach(self, driver: Any) -> None:
+        self.detach()
+        executor = driver.command_executor
+        original: Callable[[str, dict], dict] = executor.execute
+
+        def execute(command: str, params: Optional[dict] = None) -> dict:
+            started = time.perf_counter()
+            try:
+                response = original(command, params)
+            except Exception as e:
+                self._write_command(started, command, params, None, type(e).__name__)
+                raise
+            self._write_command(started, command, params, response, None)
+            return response
+
+        executor.execute = execute
+        self._executor = executor
+
+    def detach(self) -> None:
+        if self._executor is not None:
+            del self._executor.execute  # 인스턴스 속성 제거. 원래 메서드로 복구.
+            self._executor = None
+
+    # 이후 명령을 해당 행의 명령으로 구분.
+    def mark_row(self, row: int) -> None:
+        self._write({"row": row, "t": self._elapsed(time.perf_counter())})
+
+    def close(self) -> None:
+        self.detach()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logging.info(f"명령 기록 저장 : [{self.path}]")
+
+    def _elapsed(self, now: float) -> float:
+        return round((now - self._start) * 1000, 1)
+
+    def _write_command(self, started: float, command: str, params: Optional[dict], response: Optional[dict],
+                       exception: Optional[str]) -> None:
+        record = {
+            "t": self._elapsed(started),
+            "d": round((time.perf_counter() - started) * 1000, 2),
+            "c": command,
+        }
+        compact_params = _compact_params(params)
+        if compact_params:
+            record["p"] = compact_params
+        if exception is not None:
+            record["e"] = exception
+        elif response is not None:
+            error = _response_error(response)
+            if error is not None:
+                record["e"] = error
+            else:
+                record["r"] = compact_value(response.get("value"))
+        self._write(record)
+
+    def _write(self, record: dict) -> None:
+        if self._file is None:
+            self.records.append(record)
+            return
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str))
+        self._file.write("\n")
+
+
+def read_trace(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# 기록된 명령을 행별로 집계.
+# 반환값: {"rows": 행 수, "commands": 전체 명령 수, "per_row": 행별 명령 수, "by_command": 명령별 횟수,
+#         "round_trip_ms": 명령 왕복 시간 합계}
+def summarize(records: Iterable[dict]) -> dict:
+    per_row: dict[int, int] = {}
+    by_command: dict[str, int] = {}
+    commands = 0
+    round_trip_ms = 0.0
+    row = 0  # 첫 행 표시 이전의 명령(시작 페이지 확인 등)은 0 행.
+    for record in records:
+        if "row" in record:
+            row = record["row"]
+            per_row.setdefault(row, 0)
+            continue
+        if "c" not in record:
+            continue
+        commands += 1
+        round_trip_ms += record.get("d", 0)
+        per_row[row] = per_row.get(row, 0) + 1
+        by_command[record["c"]] = by_command.get(record["c"], 0) + 1
+    return {
+        "rows": len([r for r in per_row if r > 0]),
+        "commands": commands,
+        "per_row": per_row,
+        "by_command": by_command,
+        "round_trip_ms": round(round_trip_ms, 1),
+    }
+
+
+# 명령 인자에서 세션 아이디를 제외하고, 입력 값은 길이만 남김. (개인정보 기록 방지)
+def _compact_params(params: Optional[dict]) -> dict:
+    if not params:
+        return {}
+    compact = {key: value for key, value in params.items() if key != "sessionId"}
+    if "text" in compact:
+        compact["text"] = _mask(compact["text"])
+        compact.pop("value", None)
+    if "args" in compact:
+        compact["args"] = [compact_value(arg) for arg in compact["args"]]
+    return compact
+
+
+# 특수키(Ctrl, Delete 등 유니코드 사용자 정의 영역 문자)를 제외한 입력 문자를 가림.
+def _mask(text: str) -> str:
+    return "".join(c if "\ue000" <= c <= "\uf8ff" else "*" for c in text)
+
+
+# 요소 참조는 {"el": 아이디} 로, 긴 문자열은 잘라서 기록.
+def compact_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if _ELEMENT_KEY in value:
+            return {"el": value[_ELEMENT_KEY]}
+        return {key: compact_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [compact_value(item) for item in value]
+    if isinstance(value, str) and len(value) > _MAX_TEXT_LENGTH:
+        return value[:_MAX_TEXT_LENGTH]
+    return value
+
+
+# compact_value 로 기록된 값을 웹드라이버 응답 형식으로 복원.
+def expand_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"el"}:
+            return {_ELEMENT_KEY: value["el"]}
+        return {key: expand_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand_value(item) for item in value]
+    return value
+
+
+# 오류 응답의 W3C 오류 코드. (예: "no such alert") 정상 응답이면 None.
+def _response_error(response: dict) -> Optional[str]:
+    status = response.get("status")
+    value = response.get("value")
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+    if isinstance(value, dict):
+        value = value.get("value", value) if len(value) == 1 else value
+        if isinstance(value, dict) and "error" in value:
+            return str(value["error"])
+    if status and status != 0:
+        return str(status)
+    return None
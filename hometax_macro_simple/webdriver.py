@@ -1,27 +1,73 @@
+import functools
+import json
 import logging
 import os
 import platform
+import string
 import sys
 import time
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
+from urllib.parse import urlparse
 
 import browsers
+import urllib3
 from selenium import webdriver
 from selenium.webdriver import Keys
+from selenium.common.exceptions import NoAlertPresentException, TimeoutException, UnexpectedAlertPresentException
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.proxy import Proxy, ProxyType
 from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.remote import utils
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.errorhandler import ErrorCode
+from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.select import Select
 from selenium.webdriver.support.wait import WebDriverWait
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
 
 from hometax_macro_simple.exception import InvalidDataException
+from hometax_macro_simple.trace import TraceRecorder
 
 _SITE_URL: str = "https://www.hometax.go.kr"
 _USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36 Edg/121.0.0.0"
 _TARGET_BROWSER: str = "msedge"
 
+# 브라우저 세션의 제한 시간(초). 초과시 드라이버가 TimeoutException 오류 응답을 반환.
+_IMPLICIT_WAIT: float = 7
+_PAGE_LOAD_TIMEOUT: float = 120  # 페이지 이동, 이동을 일으키는 클릭
+_SCRIPT_TIMEOUT: float = 30  # 비동기 스크립트 (알림창 가로채기 대기)
+
+# 로컬 msedgedriver 와의 통신 설정.
+_DRIVER_CONNECT_TIMEOUT: float = 2  # 연결 제한 시간(초). 같은 컴퓨터이므로 짧게.
+# 응답 제한 시간(초). 드라이버가 먼저 제한 시간 오류를 반환하도록 세션의 제한 시간보다 길게.
+_DRIVER_READ_TIMEOUT: float = max(_IMPLICIT_WAIT, _PAGE_LOAD_TIMEOUT, _SCRIPT_TIMEOUT) + 30
+_DRIVER_POOL_SIZE: int = 2  # 매크로 + 세션 유지 요청
+
+# 읽기 전용 DOM 조회 스크립트. 요소 찾기와 값 읽기를 명령 한 번으로 처리하며 조회 결과를 순서대로 반환.
+_READ_ELEMENTS_SCRIPT: str = """
+return arguments[0].map(function (query) {
+    var element = document.getElementById(query[0]);
+    if (query[1] === "exists") return element !== null;
+    if (element === null) return null;
+    if (query[1] === "text") return element.innerText;
+    return element[query[1]];
+});
+"""
+
+# 로그아웃 또는 세션 만료시 표시되는 알림창 문구.
+_SESSION_EXPIRED_MESSAGES: list[str] = [
+    "로그아웃",
+    "세션",
+    "다시 로그인",
+    "로그인 후",
+    "로그인이 필요",
+    "시간이 만료",
+    "시간이 초과",
+]
+
 
 class InputID(Enum):
     NAME: str = "mf_txppWframe_edtIeNm"
@@ -54,26 +100,157 @@ class ElementID(Enum):
     WORKING_PAGE_ID: str = "mf_txppWframe_textbox922"
 
 
+class AlertMessage(Enum):
+    PERSONAL_ID_OK: str = "확인완료되었습니다."
+    PERSONAL_ID_INVALID: str = "주민등록번호를 확인 해주세요."
+    SAVE_CONFIRM: str = "저장하시겠습니까?"  # 근무처별 소득명세, 소득ㆍ세액공제명세 단계 확인창
+    RECALCULATED: str = "재계산이 완료되었습니다."
+    SUBMIT_CONFIRM: str = "입력완료 하시겠습니까?"  # 입력완료 확인창
+    SUBMITTED: str = "처리가 완료되었습니다"
+    DUPLICATED: str = "기존 수록자료가 존재합니다"
+
+
+# 알림창, 확인창 응답표. (True: 확인, False: 취소)
+# 단계별 네이티브 처리와 알림창 가로채기가 같은 표를 사용. 메시지는 시작 문구로 비교.
+_ALERT_ANSWERS: dict[AlertMessage, bool] = {
+    AlertMessage.PERSONAL_ID_OK: False,
+    AlertMessage.PERSONAL_ID_INVALID: False,
+    AlertMessage.SAVE_CONFIRM: True,
+    AlertMessage.RECALCULATED: False,
+    AlertMessage.SUBMIT_CONFIRM: True,
+    AlertMessage.SUBMITTED: True,
+    AlertMessage.DUPLICATED: True,
+}
+# 알림창 가로채기 사용시 응답표에 없는 확인창은 취소하고 기록에 표시.
+_UNKNOWN_CONFIRM_ANSWER: bool = False
+
+# window.alert, window.confirm 을 대체하여 메시지를 순번과 함께 기록하고 응답표에 따라 바로 응답.
+# 홈텍스 작업 화면(mf_txppWframe)은 같은 문서에 있으므로 최상위 창에만 설치. 이미 설치된 페이지에서는 아무것도 하지 않음.
+_ALERT_HOOK_SCRIPT: str = """
+(function (answers, unknownAnswer) {
+    if (window.__hometaxMacroAlerts) return;
+    var alerts = window.__hometaxMacroAlerts = [];
+    window.__hometaxMacroOriginal = {alert: window.alert, confirm: window.confirm};
+    var sequence = 0;
+    function record(type, message) {
+        message = String(message);
+        var entry = {seq: ++sequence, type: type, message: message, known: false, answer: unknownAnswer};
+        for (var i = 0; i < answers.length; i++) {
+            if (message.indexOf(answers[i][0]) === 0) {
+                entry.known = true;
+                entry.answer = answers[i][1];
+                break;
+            }
+        }
+        alerts.push(entry);
+        return entry.answer;
+    }
+    window.alert = function (message) { record("alert", message); };
+    window.confirm = function (message) { return record("confirm", message); };
+})(%s, %s);
+""" % (json.dumps([[message.value, answer] for message, answer in _ALERT_ANSWERS.items()], ensure_ascii=False),
+       json.dumps(_UNKNOWN_CONFIRM_ANSWER))
+
+_ALERT_UNHOOK_SCRIPT: str = """
+if (window.__hometaxMacroOriginal) {
+    window.alert = window.__hometaxMacroOriginal.alert;
+    window.confirm = window.__hometaxMacroOriginal.confirm;
+}
+delete window.__hometaxMacroOriginal;
+delete window.__hometaxMacroAlerts;
+"""
+
+# 기록된 알림창 메시지를 브라우저 안에서 기다렸다가 가장 오래된 것을 꺼내 반환. (명령 한 번)
+# 시간 초과시 null, 가로채기가 설치되지 않은 페이지면 {missing: true}.
+# 세션 만료 메시지(arguments[1])는 꺼내지 않고 그대로 반환. (세션 확인에서 처리)
+_WAIT_ALERT_SCRIPT: str = """
+var timeout = arguments[0], expiredMessages = arguments[1], done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeout;
+(function poll() {
+    var alerts = window.__hometaxMacroAlerts;
+    if (!alerts) return done({missing: true});
+    if (alerts.length > 0) {
+        var entry = alerts[0];
+        entry.expired = expiredMessages.some(function (message) { return entry.message.indexOf(message) >= 0; });
+        if (!entry.expired) alerts.shift();
+        return done(entry);
+    }
+    if (Date.now() > deadline) return done(null);
+    setTimeout(poll, 50);
+})();
+"""
+
+# 기록된 메시지 중 첫 번째 세션 만료 메시지를 꺼내 반환. 없으면 null.
+_TAKE_SESSION_EXPIRED_ALERT_SCRIPT: str = """
+var expiredMessages = arguments[0], alerts = window.__hometaxMacroAlerts || [];
+for (var i = 0; i < alerts.length; i++) {
+    var message = alerts[i].message;
+    if (expiredMessages.some(function (expired) { return message.indexOf(expired) >= 0; })) {
+        alerts.splice(i, 1);
+        return message;
+    }
+}
+return null;
+"""
+
+# 이전 단계에서 처리하지 않은 메시지를 비움. 세션 만료 메시지는 세션 확인을 위해 남김.
+_CLEAR_ALERTS_SCRIPT: str = """
+var expiredMessages = arguments[0];
+if (window.__hometaxMacroAlerts) {
+    var remaining = window.__hometaxMacroAlerts.filter(function (entry) {
+        return expiredMessages.some(function (expired) { return entry.message.indexOf(expired) >= 0; });
+    });
+    window.__hometaxMacroAlerts.length = 0;
+    Array.prototype.push.apply(window.__hometaxMacroAlerts, remaining);
+}
+"""
+
+
 class WebDriverManager:
     def __init__(self):
         self._webdriver: Optional[_EdgeDriver] = None
+        self._trace: Optional[TraceRecorder] = None
+        self._alert_hook: bool = False
 
     def create(self) -> None:
         if self._webdriver is None:
             self._webdriver = _EdgeDriver()
 
     def close(self) -> None:
+        self.stop_trace()
         if self._webdriver is not None:
             self._webdriver.driver.quit()
             self._webdriver = None
 
     def control(self):
-        return _Control(self._webdriver.driver)
+        return _Control(self._webdriver.driver, self._alert_hook)
+
+    # 알림창 가로채기 사용 여부. 사용시 알림창을 기다리지 않고 페이지에서 바로 응답. (실험적 기능)
+    # 매크로 실행 중에만 작업 페이지의 최상위 문서에 설치. (행 시작시 reset 에서 설치, 실행 종료시 해제)
+    def set_alert_hook(self, enabled: bool) -> None:
+        self._alert_hook = enabled
+
+    # 웹드라이버 명령 기록 시작. meta 는 기록 파일 첫 줄에 저장.
+    def start_trace(self, path: str, meta: Optional[dict] = None) -> None:
+        self.stop_trace()
+        self._trace = TraceRecorder(path, {**(meta or {}), "alert_hook": self._alert_hook})
+        self._trace.attach(self._webdriver.driver)
+
+    def stop_trace(self) -> None:
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+
+    # 명령 기록 중이면 이후 명령을 해당 행으로 구분.
+    def mark_row(self, row: int) -> None:
+        if self._trace is not None:
+            self._trace.mark_row(row)
 
 
 class _Control:
-    def __init__(self, driver: webdriver.Edge):
+    def __init__(self, driver: webdriver.Edge, alert_hook: bool = False):
         self._driver: webdriver.Edge = driver
+        self._alert_hook: bool = alert_hook
 
     # 홈텍스 사이트 열기
     def open(self) -> None:
@@ -84,8 +261,8 @@ class _Control:
         self.switch_to_default_content()
         err_msg = "메크로 시작 페이지가 아닙니다."
         try:
-            text = self._driver.find_element(By.ID, ElementID.WORKING_PAGE_ID.value).text
-            if not text.startswith("근로소득 지급명세서"):
+            text, = _read_elements(self._driver, [(ElementID.WORKING_PAGE_ID.value, "text")])
+            if text is None or not text.startswith("근로소득 지급명세서"):
                 logging.info(f"{err_msg}")
                 return False
         except Exception as e:
@@ -97,6 +274,91 @@ class _Control:
     def switch_to_default_content(self) -> None:
         self._driver.switch_to.default_content()
 
+    # 알림창을 기다려 메시지를 반환. 네이티브 알림창은 응답표의 expected 응답에 따라 확인 또는 취소.
+    # 알림창 가로채기 사용시 페이지에서 이미 응답한 메시지를 가져오며, 대기 전 고정 대기(delay)는 생략.
+    # 응답표에 없는 확인창은 가로채기에서 취소되었으므로 InvalidDataException 발생.
+    # 세션 만료 알림창은 처리하지 않고 남겨둔 채 UnexpectedAlertPresentException 발생. (세션 확인에서 처리)
+    def _handle_alert(self, timeout: float, expected: AlertMessage, delay: float = 0) -> str:
+        if self._alert_hook:
+            entry = self._driver.execute_async_script(_WAIT_ALERT_SCRIPT, int(timeout * 1000),
+                                                      _SESSION_EXPIRED_MESSAGES)
+            if entry is None:
+                raise TimeoutException(f"알림창 대기 시간 초과. [{timeout}초]")
+            if not entry.get("missing"):
+                if entry["expired"]:
+                    raise UnexpectedAlertPresentException("세션 만료 알림창.", alert_text=entry["message"])
+                logging.info(f"알림창 [{entry['seq']}] {entry['type']} : [{entry['message']}]")
+                if entry["type"] == "confirm" and not entry["known"]:
+                    raise InvalidDataException(f"응답표에 없는 확인창. 취소됨. [{entry['message']}]")
+                return entry["message"]
+            # 페이지가 바뀌어 설치되지 않은 경우. 이번 알림창은 직접 처리하고, 다음 행 초기화(reset)에서 다시 설치.
+            logging.info("알림창 가로채기가 설치되지 않은 페이지. 알림창을 직접 처리.")
+
+        time.sleep(delay)
+        WebDriverWait(self._driver, timeout).until(ec.alert_is_present())
+        alert = self._driver.switch_to.alert
+        alert_message = alert.text
+        if _is_session_expired_message(alert_message):
+            raise UnexpectedAlertPresentException("세션 만료 알림창.", alert_text=alert_message)
+        if _ALERT_ANSWERS[expected]:
+            alert.accept()
+        else:
+            alert.dismiss()
+        self.switch_to_default_content()
+        return alert_message
+
+    # 단계 확인창 처리. 예상한 확인창이 아니면 가로채기 사용시 InvalidDataException 발생.
+    # (가로채기는 메시지로 응답을 정하므로 다른 메시지는 단계 진행을 보장하지 않음. 네이티브 처리는 기록만 남김)
+    def _confirm(self, timeout: float, expected: AlertMessage, delay: float = 0) -> None:
+        message = self._handle_alert(timeout, expected, delay)
+        if message.startswith(expected.value):
+            return
+        if self._alert_hook:
+            self.reset()
+            raise InvalidDataException(f"예상과 다른 확인창. [{message}] (예상: [{expected.value}])")
+        logging.info(f"예상과 다른 확인창. [{message}] (예상: [{expected.value}])")
+
+    # 알림창 가로채기 해제. 매크로 실행 종료, 재로그인 대기시 사용자가 알림창을 직접 볼 수 있도록 함.
+    def remove_alert_hook(self) -> None:
+        if self._alert_hook:
+            self.switch_to_default_content()
+            self._driver.execute_script(_ALERT_UNHOOK_SCRIPT)
+
+    # 세션 만료 알림창 확인. 로그아웃, 세션 만료 알림창이 떠 있으면 닫고 True 반환.
+    # 알림창 가로채기 사용시 기록된 메시지도 확인.
+    def accept_session_expired_alert(self) -> bool:
+        try:
+            alert = self._driver.switch_to.alert
+            alert_message = alert.text
+        except NoAlertPresentException:
+            if not self._alert_hook:
+                return False
+            alert_message = self._driver.execute_script(_TAKE_SESSION_EXPIRED_ALERT_SCRIPT, _SESSION_EXPIRED_MESSAGES)
+            if alert_message is None:
+                return False
+            logging.info(f"세션 만료 알림창 (가로챔) : [{alert_message}]")
+            return True
+
+        if not _is_session_expired_message(alert_message):
+            # 매크로 단계에서 처리할 알림창. 그대로 둔다.
+            return False
+        logging.info(f"세션 만료 알림창 : [{alert_message}]")
+        alert.accept()
+        self.switch_to_default_content()
+        return True
+
+    # 세션 유지를 위해 같은 도메인으로 요청을 보냄. 응답은 기다리지 않음.
+    # 알림창이 떠 있으면 보내지 않음. (스크립트 실행시 드라이버가 알림창을 닫으므로)
+    def keep_alive(self) -> None:
+        try:
+            _ = self._driver.switch_to.alert
+            logging.info("알림창이 떠 있어 세션 유지 요청을 건너뜀.")
+            return
+        except NoAlertPresentException:
+            pass
+        self._driver.execute_script(
+            "fetch(window.location.origin + '/', {credentials: 'include', cache: 'no-store'}).catch(() => {});")
+
     def set_name(self, name: str) -> None:
         _set_input_value(self._driver, InputID.NAME.value, name)
 
@@ -105,19 +367,13 @@ class _Control:
         self._driver.find_element(By.ID, ButtonID.CHECK_PERSONAL_ID.value).click()
 
         # 주민등록번호 확인창
-        ok_message = "확인완료되었습니다."
-        error_message = "주민등록번호를 확인 해주세요."
-        WebDriverWait(self._driver, 4).until(ec.alert_is_present())
-        alert = self._driver.switch_to.alert
-        alert_message = alert.text
+        alert_message = self._handle_alert(4, AlertMessage.PERSONAL_ID_OK)
         logging.info(f"{alert_message}")
-        alert.dismiss()
-        self.switch_to_default_content()
 
-        if alert_message.startswith(ok_message):
+        if alert_message.startswith(AlertMessage.PERSONAL_ID_OK.value):
             return
         self.reset()
-        if alert_message.startswith(error_message):
+        if alert_message.startswith(AlertMessage.PERSONAL_ID_INVALID.value):
             # 현재 오류가난 행 반환, 해당 행의 매크로 종료
             raise InvalidDataException(f"Invalid personal ID [{personal_id}]")
         else:
@@ -157,11 +413,7 @@ class _Control:
 
     def confirm_step_1(self) -> None:
         self._driver.find_element(By.ID, ButtonID.STEP_1_CONFIRM.value).click()
-        time.sleep(1)
-        WebDriverWait(self._driver, 10).until(ec.alert_is_present())
-        confirm = self._driver.switch_to.alert
-        confirm.accept()
-        self.switch_to_default_content()
+        self._confirm(10, AlertMessage.SAVE_CONFIRM, delay=1)
         time.sleep(1)
 
     def set_step_2_woman_deduction(self, eligible: bool) -> None:
@@ -181,57 +433,38 @@ class _Control:
 
     def confirm_step_2(self) -> None:
         self._driver.find_element(By.ID, ButtonID.STEP_2_CONFIRM.value).click()
-        time.sleep(1)
-        WebDriverWait(self._driver, 10).until(ec.alert_is_present())
-        confirm = self._driver.switch_to.alert
-        confirm.accept()
-        self.switch_to_default_content()
+        self._confirm(10, AlertMessage.SAVE_CONFIRM, delay=1)
 
     def set_step_3_national_pension(self, national_pension: str) -> None:
         _set_input_value(self._driver, InputID.STEP_3_NATIONAL_PENSION.value, national_pension)
 
     def confirm_final_step(self) -> None:
         self._driver.find_element(By.ID, ButtonID.FINAL_1_CONFIRM.value).click()
-        time.sleep(1)
 
         # 계산하기 창 확인
-        message_ok_1 = "재계산이 완료되었습니다."
-        WebDriverWait(self._driver, 10).until(ec.alert_is_present())
-        confirm = self._driver.switch_to.alert
-        confirm_message = confirm.text
+        confirm_message = self._handle_alert(10, AlertMessage.RECALCULATED, delay=1)
         logging.info(f"계산하기 단계 : [{confirm_message}]")
-        confirm.dismiss()
         time.sleep(4)
-        self.switch_to_default_content()
-        if not confirm_message.startswith(message_ok_1):
+        if not confirm_message.startswith(AlertMessage.RECALCULATED.value):
             logging.info(f"재계산 실패. [{confirm_message}]")
             self.reset()
             raise InvalidDataException("웹드라이버: 재계산 실패.")
 
         # 입력완료 버튼
         self._driver.find_element(By.ID, ButtonID.FINAL_2_CONFIRM.value).click()
-        time.sleep(1)
-
-        # 입력완료 알림창 확인
-        WebDriverWait(self._driver, 10).until(ec.alert_is_present())
-        submit = self._driver.switch_to.alert
-        submit.accept()
 
         # 입력완료 확인창
-        message_ok_2 = "처리가 완료되었습니다"
-        message_duplicated = "기존 수록자료가 존재합니다"
-        WebDriverWait(self._driver, 12).until(ec.alert_is_present())
-        alert_dialog = self._driver.switch_to.alert
-        alert_message = alert_dialog.text
+        self._confirm(10, AlertMessage.SUBMIT_CONFIRM, delay=1)
+
+        # 입력완료 결과 알림창
+        alert_message = self._handle_alert(12, AlertMessage.SUBMITTED)
         logging.info(f"추가하기 단계 : [{alert_message}]")
-        alert_dialog.accept()
         time.sleep(4)
-        self.switch_to_default_content()
-        if alert_message.startswith(message_ok_2):
+        if alert_message.startswith(AlertMessage.SUBMITTED.value):
             logging.info(f"추가하기 성공.")
             self._driver.execute_script("window.scrollTo(0, 0);")
             return
-        elif alert_message.startswith(message_duplicated):
+        elif alert_message.startswith(AlertMessage.DUPLICATED.value):
             logging.info(f"이미 추가된 데이터. 입력 무시됨.")
             self.reset()
             return
@@ -243,7 +476,12 @@ class _Control:
     # 작성내역 초기화
     def reset(self) -> None:  # 메인콘텐츠로 전환 -> 맨 위로 스크롤 -> 작업페이지로 전환 -> 초기화 버튼 클릭
         self.switch_to_default_content()
-        self._driver.execute_script("window.scrollTo(0, 0);")
+        if self._alert_hook:
+            # 페이지 이동으로 가로채기가 없어진 경우 다시 설치하고, 처리하지 않은 메시지를 비움.
+            self._driver.execute_script("window.scrollTo(0, 0);" + _ALERT_HOOK_SCRIPT + _CLEAR_ALERTS_SCRIPT,
+                                        _SESSION_EXPIRED_MESSAGES)
+        else:
+            self._driver.execute_script("window.scrollTo(0, 0);")
         time.sleep(2)
         _click_element_by_id(self._driver, ButtonID.RESET.value)
         time.sleep(3)
@@ -264,9 +502,83 @@ class _EdgeDriver:
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option("useAutomationExtension", False)
 
-        self.driver: webdriver = webdriver.Edge(service=EdgeService(EdgeChromiumDriverManager().install()),
-                                                options=options)
-        self.driver.implicitly_wait(7)
+        self.driver: webdriver = webdriver.Edge(service=EdgeService(install_driver()), options=options)
+        self.driver.implicitly_wait(_IMPLICIT_WAIT)
+        self.driver.set_page_load_timeout(_PAGE_LOAD_TIMEOUT)
+        self.driver.set_script_timeout(_SCRIPT_TIMEOUT)
+        # 세션 생성 후 명령 전송을 경량 연결로 교체.
+        self.driver.command_executor.close()
+        self.driver.command_executor = _EdgeRemoteConnection(self.driver.service.service_url)
+
+
+# 로컬 msedgedriver 전용 연결.
+# 하나의 연결 풀에 keep-alive 소켓을 유지하고, 헤더와 주소는 미리 계산하여 명령마다 다시 만들지 않음.
+# 프록시를 사용하지 않으므로 환경 변수의 프록시 설정에 영향받지 않음.
+# 기본 연결의 PoolManager 는 만들지 않고(keep_alive=False), 클래스 공용 제한 시간도 기존 값을 유지.
+class _EdgeRemoteConnection(ChromiumRemoteConnection):
+    def __init__(self, remote_server_addr: str):
+        super().__init__(remote_server_addr, vendor_prefix="ms", browser_name="MicrosoftEdge",
+                         client_config=ClientConfig(remote_server_addr=remote_server_addr, keep_alive=False,
+                                                    proxy=Proxy(raw={"proxyType": ProxyType.DIRECT}),
+                                                    timeout=RemoteConnection._timeout))
+        parsed_url = urlparse(remote_server_addr)
+        self._base_path: str = parsed_url.path.rstrip("/")
+        self._headers: dict = self.get_remote_connection_headers(parsed_url, keep_alive=True)
+        self._pool: urllib3.HTTPConnectionPool = urllib3.HTTPConnectionPool(
+            parsed_url.hostname, parsed_url.port, maxsize=_DRIVER_POOL_SIZE, retries=False,
+            timeout=urllib3.Timeout(connect=_DRIVER_CONNECT_TIMEOUT, read=_DRIVER_READ_TIMEOUT))
+
+    def execute(self, command: str, params: dict) -> dict:
+        command_info = self._commands.get(command) or self.extra_commands.get(command)
+        assert command_info is not None, f"Unrecognised command {command}"
+        method, path_string = command_info
+        if "$" in path_string:
+            path = string.Template(path_string).substitute(params)
+            for word in path_string.split("/"):
+                if word.startswith("$"):
+                    params.pop(word[1:], None)
+        else:
+            path = path_string
+        body = utils.dump_json(params) if method in ("POST", "PUT") else None
+        return self._request(method, self._base_path + path, body=body)
+
+    def _request(self, method: str, url: str, body: Optional[str] = None) -> dict:
+        response = self._pool.urlopen(method, url, body=body, headers=self._headers, redirect=False)
+        status = response.status
+        data = response.data.decode("UTF-8").strip()
+        if 300 <= status < 304:
+            return self._request("GET", urlparse(response.headers.get("location")).path)
+        if 399 < status <= 500:
+            return {"status": status, "value": data or str(status)}
+        try:
+            data = utils.load_json(data)
+        except ValueError:
+            return {"status": ErrorCode.SUCCESS if 199 < status < 300 else ErrorCode.UNKNOWN_ERROR, "value": data}
+        if not isinstance(data, dict):
+            return {"status": 0, "value": data}
+        data.setdefault("value", None)
+        return data
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+def _is_session_expired_message(alert_message: str) -> bool:
+    return any(message in alert_message for message in _SESSION_EXPIRED_MESSAGES)
+
+
+# 엣지 드라이버 확인 및 설치 후 경로 반환. 프로그램 실행 중 한 번만 확인.
+@functools.cache
+def install_driver() -> str:
+    return EdgeChromiumDriverManager().install()
+
+
+# 읽기 전용 DOM 조회를 스크립트 한 번으로 실행. 조회 하나당 요소 찾기 + 값 읽기 2번의 왕복이 1번으로 줄어듦.
+# 여러 조회를 함께 넘기면 같은 명령에서 처리. queries 는 (요소 아이디, 조회 항목) 목록.
+# 조회 항목은 "exists", "text" 또는 요소 속성 이름("value", "checked" 등).
+# 요소가 없으면 None ("exists" 는 False). 암묵적 대기 없이 현재 페이지 상태를 바로 반환함.
+def _read_elements(driver: webdriver.Edge, queries: list[tuple[str, str]]) -> list[Any]:
+    return driver.execute_script(_READ_ELEMENTS_SCRIPT, [list(query) for query in queries])
 
 
 def _click_element_by_id(driver: webdriver.Edge, element_id: str) -> None:
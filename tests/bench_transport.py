@@ -0,0 +1,96 @@
+# 웹드라이버 명령 전송 마이크로벤치마크.
+# 로컬 msedgedriver 대신 최소한의 W3C 응답을 돌려주는 HTTP 서버를 띄우고,
+# 기본 연결(ChromiumRemoteConnection)과 경량 연결(_EdgeRemoteConnection)의 명령당 클라이언트 처리 시간을 비교.
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium import webdriver
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.common.by import By
+
+from hometax_macro_simple.webdriver import _EdgeRemoteConnection, _read_elements
+
+_ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+_ITERATIONS = 2000
+
+
+class _DriverStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    wbufsize = -1  # 헤더와 본문을 한 번에 전송
+
+    def do_GET(self):
+        self._respond("text" if self.path.endswith("/text") else None)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/session":
+            self._respond({"sessionId": "bench", "capabilities": {"browserName": "MicrosoftEdge"}})
+        elif self.path.endswith("/element"):
+            self._respond({_ELEMENT_KEY: "element"})
+        else:
+            self._respond(None)
+
+    def do_DELETE(self):
+        self._respond(None)
+
+    def _respond(self, value):
+        body = json.dumps({"value": value}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# 한 행에서 자주 쓰는 명령 조합 반복. 명령당 평균 시간(마이크로초) 반환.
+def _measure(executor) -> float:
+    driver = webdriver.Remote(command_executor=executor, options=webdriver.EdgeOptions())
+    commands = 0
+    started = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        element = driver.find_element(By.ID, "mf_txppWframe_edtIeNm")
+        element.click()
+        element.send_keys("1234")
+        driver.execute_script("arguments[0].click();", element)
+        _ = element.text
+        driver.switch_to.default_content()
+        commands += 6
+    elapsed = time.perf_counter() - started
+    driver.quit()
+    return elapsed * 1_000_000 / commands
+
+
+# 조회 2개(요소 찾기 + 텍스트)를 스크립트 한 번으로 묶었을 때의 조회당 시간 비교.
+def _measure_batch(executor) -> tuple[float, float]:
+    driver = webdriver.Remote(command_executor=executor, options=webdriver.EdgeOptions())
+    started = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        _ = driver.find_element(By.ID, "mf_txppWframe_textbox922").text
+    separate = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        _read_elements(driver, [("mf_txppWframe_textbox922", "text")])
+    batched = time.perf_counter() - started
+    driver.quit()
+    return separate * 1_000_000 / _ITERATIONS, batched * 1_000_000 / _ITERATIONS
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _DriverStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    default_us = _measure(ChromiumRemoteConnection(url, vendor_prefix="ms", browser_name="MicrosoftEdge"))
+    tuned_us = _measure(_EdgeRemoteConnection(url))
+    print(f"기본 연결 : 명령당 {default_us:.1f}us")
+    print(f"경량 연결 : 명령당 {tuned_us:.1f}us ({(1 - tuned_us / default_us) * 100:.0f}% 감소)")
+
+    separate_us, batched_us = _measure_batch(_EdgeRemoteConnection(url))
+    print(f"요소 텍스트 조회 : 개별 명령 {separate_us:.1f}us, 스크립트 묶음 {batched_us:.1f}us")
+    server.shutdown()